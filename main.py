@@ -1,13 +1,25 @@
 import warnings
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import json
 from datetime import datetime, timezone
 import os
+import time
+import hashlib
 import threading
 import queue
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
 
+import orjson
+
+from src.core.document_text import (
+    MIN_EXTRACTED_TEXT_CHARS,
+    read_cached_text,
+    read_document_text,
+    read_sidecar,
+    start_pdf_workers,
+)
+
 # Suppress deprecation warnings
 warnings.filterwarnings(
     "ignore", category=DeprecationWarning, message=".*datetime.datetime.utcnow.*"
@@ -32,21 +44,41 @@ warnings.filterwarnings(
     "ignore", category=UserWarning, message=".*development server.*"
 )
 
+# PDF pool workers (forkserver, see src.core.document_text) re-import this script
+# as __mp_main__. They only parse PDFs, so they skip ChromaDB / AI engine setup
+# and the upload thread
+_IN_PDF_WORKER = __name__ == "__mp_main__"
+
 # Try to import core modules with error handling
 try:
+    if _IN_PDF_WORKER:
+        raise ImportError("core modules are not loaded in PDF worker processes")
     from src.models.database import init_db, Document, Job
-    from src.core.rag_engine import ingest_text, ingest_file, has_id, query
+    from src.core.rag_engine import (
+        ingest_text,
+        ingest_batch,
+        ingest_file,
+        has_id,
+        query,
+        embed,
+        REPORT_QUERY,
+        get_cached_evaluation,
+        cache_evaluation,
+    )
     from src.core.ai_engine_manager import (
         evaluate_cv,
         evaluate_project,
         synthesize_overall,
         get_engine_info,
+        get_result_model,
+        get_cache_version,
     )
 
     dependenciesAvailable = True
 except ImportError as e:
-    print(f"Warning: Some dependencies are missing: {e}")
-    print("Application will run in limited mode")
+    if not _IN_PDF_WORKER:
+        print(f"Warning: Some dependencies are missing: {e}")
+        print("Application will run in limited mode")
     dependenciesAvailable = False
     # Create dummy functions for graceful degradation
     init_db = lambda: None
@@ -59,18 +91,26 @@ except ImportError as e:
         {
             "create": lambda *a, **k: None,
             "get_by_id": lambda *a: None,
+            "get_with_documents": lambda *a, **k: None,
             "update_status": lambda *a, **k: None,
             "count": lambda: 0,
         },
     )
     ingest_text = lambda *a, **k: None
+    ingest_batch = lambda *a, **k: None
+    get_cached_evaluation = lambda *a, **k: None
+    cache_evaluation = lambda *a, **k: None
     ingest_file = lambda *a, **k: None
     has_id = lambda *a: False
     query = lambda *a, **k: []
+    embed = lambda *a: None
+    REPORT_QUERY = ""
     evaluate_cv = lambda *a, **k: type("Result", (), {"dict": lambda: {}})()
     evaluate_project = lambda *a, **k: type("Result", (), {"dict": lambda: {}})()
     synthesize_overall = lambda *a, **k: type("Result", (), {"dict": lambda: {}})()
     get_engine_info = lambda: {"current_engine": "none", "available": False}
+    get_result_model = lambda *a: None
+    get_cache_version = lambda: "none"
 
 # Simple Redis-based worker instead of Celery
 try:
@@ -87,11 +127,14 @@ except ImportError:
     )()
 
 try:
+    if _IN_PDF_WORKER:
+        raise ImportError("monitoring is not loaded in PDF worker processes")
     from src.monitoring.health import comprehensive_health_check, get_service_metrics
 
     MONITORING_AVAILABLE = True
 except ImportError:
-    print("Warning: Monitoring modules not available")
+    if not _IN_PDF_WORKER:
+        print("Warning: Monitoring modules not available")
     MONITORING_AVAILABLE = False
     comprehensive_health_check = lambda: {
         "status": "unknown",
@@ -115,46 +158,97 @@ CORS(app)
 upload_queue = queue.Queue(maxsize=100)
 
 
-def _read_pdf_text(path):
+# Extracted text keyed by SHA-256 of the file bytes, so re-uploads and retried
+# jobs skip parsing
+TEXT_CACHE_DIR = os.path.join(UPLOAD_DIR, ".cache")
+
+
+def _get_or_extract(path):
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        return read_document_text(path)
+
+    cache_path = os.path.join(TEXT_CACHE_DIR, f"{digest.hexdigest()}.txt")
     try:
-        from PyPDF2 import PdfReader
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        pass
+
+    # Long PDFs are parsed in document_text's process pool, so parsing does not
+    # compete for the GIL with request handling and LLM I/O threads
+    text = read_document_text(path)
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ Could not write text cache for {path}: {e}")
+    return text
 
-        reader = PdfReader(path)
-        return "\n\n".join((p.extract_text() or "") for p in reader.pages)
-    except Exception:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
-        except Exception:
-            return ""
+
+# Upload processing coalesces files arriving within this window into one Chroma ingest
+UPLOAD_BATCH_MAX = 32
+UPLOAD_BATCH_WAIT = 0.5
 
 
 def _process_uploaded_file(doc_id, path, doc_type):
+    """Extract text and write the sidecar; returns the RAG ingest item (or None)"""
     try:
-        text = _read_pdf_text(path)
+        text = _get_or_extract(path)
         sidecar = f"{path}.txt"
         with open(sidecar, "w", encoding="utf-8") as f:
             f.write(text or "")
-        # Ingest ke Chroma untuk RAG
-        ingest_text(
-            f"doc:{doc_id}", text or "", metadata={"path": path, "doc_type": doc_type}
-        )
+        return (f"doc:{doc_id}", text or "", {"path": path, "doc_type": doc_type})
     except Exception:
-        pass
+        return None
 
 
 def _upload_worker():
     while True:
-        task = upload_queue.get()
+        batch = [upload_queue.get()]
+
+        # Coalesce uploads that arrive within UPLOAD_BATCH_WAIT
+        deadline = time.monotonic() + UPLOAD_BATCH_WAIT
+        while len(batch) < UPLOAD_BATCH_MAX:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(upload_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        items = []
         try:
-            _process_uploaded_file(task["doc_id"], task["path"], task["doc_type"])
+            for task in batch:
+                item = _process_uploaded_file(task["doc_id"], task["path"], task["doc_type"])
+                if item:
+                    items.append(item)
+            # Ingest ke Chroma untuk RAG dalam satu call
+            ingest_batch(items)
+        except Exception as e:
+            print(f"⚠️ Batch RAG ingest failed, ingesting {len(items)} document(s) one by one: {e}")
+            for doc_id, text, metadata in items:
+                try:
+                    ingest_text(doc_id, text, metadata=metadata)
+                except Exception:
+                    pass
         finally:
-            upload_queue.task_done()
+            for _ in batch:
+                upload_queue.task_done()
 
 
 # Mulai worker thread
 _upload_thread = threading.Thread(target=_upload_worker, daemon=True)
-_upload_thread.start()
+if not _IN_PDF_WORKER:
+    _upload_thread.start()
 
 
 @app.route("/")
@@ -433,68 +527,101 @@ def upload_documents():
 
 def _load_case_study_text() -> str:
     try:
-        with open(CASE_STUDY_PATH, "r", encoding="utf-8") as f:
-            return f.read()
-    except Exception:
+        return read_cached_text(CASE_STUDY_PATH)
+    except OSError:
         return ""
 
 
+def _evaluate_cached(kind, key_text, evaluate):
+    # Entries are versioned by engine, prompts and model, and read back with the
+    # current engine's own result model
+    version = get_cache_version()
+    model_cls = get_result_model(kind)
+    cached = get_cached_evaluation(kind, key_text, version)
+    if cached:
+        try:
+            return model_cls.model_validate_json(cached)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable cached {kind} evaluation: {e}")
+
+    result = evaluate()
+    # A fallback engine returns its own result model; only cache the current engine's
+    if type(result) is model_cls:
+        cache_evaluation(kind, key_text, result.model_dump_json(), version)
+    return result
+
+
 def _run_job(job_id):
     try:
-        Job.update_status(job_id, "processing")
-        job = Job.get_by_id(job_id)
+        # Status update plus job and document paths in a single DB round-trip
+        job = Job.get_with_documents(job_id, mark_processing=True)
         if not job:
             Job.update_status(job_id, "failed", error_message="Job tidak ditemukan")
             return
 
-        # Convert sqlite3.Row to dict to avoid .get() method issues
-        job_dict = dict(job)
-        cv_row = Document.get_by_id(job_dict["cv_id"]) if job_dict["cv_id"] else None
-        report_row = (
-            Document.get_by_id(job_dict["report_id"]) if job_dict["report_id"] else None
-        )
+        cv_path = job["cv_path"]
+        report_path = job["report_path"]
 
-        # Convert Document rows to dict to avoid .get() method issues
-        cv_dict = dict(cv_row) if cv_row else None
-        report_dict = dict(report_row) if report_row else None
+        cv_sidecar = f"{cv_path}.txt" if cv_path else None
+        report_sidecar = f"{report_path}.txt" if report_path else None
 
-        cv_sidecar = f"{cv_dict['path']}.txt" if cv_dict else None
-        report_sidecar = f"{report_dict['path']}.txt" if report_dict else None
-
-        if cv_sidecar and os.path.exists(cv_sidecar):
-            with open(cv_sidecar, "r", encoding="utf-8") as f:
-                cv_text = f.read()
-        else:
-            cv_text = _read_pdf_text(cv_row["path"]) if cv_row else ""
+        # EAFP: open the sidecar directly and fall back to extraction when missing
+        try:
+            cv_text = read_sidecar(cv_sidecar)
+        except (OSError, TypeError):
+            cv_text = _get_or_extract(cv_path) if cv_path else ""
 
-        if report_sidecar and os.path.exists(report_sidecar):
-            with open(report_sidecar, "r", encoding="utf-8") as f:
-                report_text = f.read()
-        else:
-            report_text = _read_pdf_text(report_row["path"]) if report_row else ""
+        try:
+            report_text = read_sidecar(report_sidecar)
+        except (OSError, TypeError):
+            report_text = _get_or_extract(report_path) if report_path else ""
+
+        # Nothing to evaluate: fail fast instead of spending LLM calls on it
+        if (
+            len(cv_text.strip()) < MIN_EXTRACTED_TEXT_CHARS
+            or len(report_text.strip()) < MIN_EXTRACTED_TEXT_CHARS
+        ):
+            Job.update_status(job_id, "failed", error_message="insufficient text extracted")
+            return
 
         case_brief_text = _load_case_study_text()
 
-        # RAG retrieval (opsional): ambil snippet terkait untuk prompt LLM
-        cv_snippets = [
-            d["document"] for d in query(job["job_title"] or "", n_results=3)
-        ]
-        report_snippets = [
-            d["document"]
-            for d in query(
-                "project scoring prompt chaining RAG error handling", n_results=3
+        # RAG retrieval and the CV / project evaluations are independent, so
+        # each pair runs concurrently
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            # RAG retrieval (opsional): ambil snippet terkait untuk prompt LLM
+            cv_query = pool.submit(query, job["job_title"] or "", n_results=3)
+            # The report query never changes: reuse its cached embedding
+            report_query = pool.submit(
+                lambda: query(REPORT_QUERY, n_results=3, query_embedding=embed(REPORT_QUERY))
+            )
+            cv_snippets = [d["document"] for d in cv_query.result()]
+            report_snippets = [d["document"] for d in report_query.result()]
+
+            # Use LLM module with built-in fallback mechanism; identical (or, if enabled,
+            # semantically similar) inputs reuse a previous evaluation. The candidate
+            # text leads the key because the embedder only sees its first ~256 tokens
+            cv_future = pool.submit(
+                _evaluate_cached,
+                "cv",
+                f"{cv_text}\n{job['job_title'] or ''}",
+                lambda: evaluate_cv(cv_text, job["job_title"] or "", cv_snippets),
+            )
+            pr_future = pool.submit(
+                _evaluate_cached,
+                "project",
+                f"{report_text}\n{case_brief_text}",
+                lambda: evaluate_project(report_text, case_brief_text, report_snippets),
             )
-        ]
+            cv_res = cv_future.result()
+            pr_res = pr_future.result()
 
-        # Use LLM module with built-in fallback mechanism
-        cv_res = evaluate_cv(cv_text, job["job_title"] or "", cv_snippets)
-        pr_res = evaluate_project(report_text, case_brief_text, report_snippets)
         overall = synthesize_overall(cv_res, pr_res)
         result = (
             overall.model_dump() if hasattr(overall, "model_dump") else overall.dict()
         )
 
-        Job.update_status(job_id, "completed", result_json=json.dumps(result))
+        Job.update_status(job_id, "completed", result_json=orjson.dumps(result).decode())
     except Exception as e:
         Job.update_status(job_id, "failed", error_message=str(e))
 
@@ -687,9 +814,15 @@ def metrics():
 
 
 # ========= Result Endpoint =========
+# Upper bound for the ?wait= long-poll so a request cannot hold a server thread indefinitely
+RESULT_MAX_WAIT_SECONDS = 30
+
+
 @app.route("/result/<int:job_id>", methods=["GET"])
 def get_result(job_id):
     start_time = datetime.now(timezone.utc)
+    # Long-poll: ?wait=N holds the request up to N seconds for a queued/processing job to finish
+    wait = min(max(request.args.get("wait", default=5, type=int), 0), RESULT_MAX_WAIT_SECONDS)
     print(f"🔍 [RESULT] Starting result retrieval for job {job_id} at {start_time}")
 
     try:
@@ -712,9 +845,9 @@ def get_result(job_id):
             print(
                 f"⏳ [RESULT] Job {job_id} is still {status}, checking Redis for results..."
             )
-            # Try to get result from Simple Redis Worker with proper timeout
+            # Try to get result from Simple Redis Worker, waiting up to `wait` seconds
             redis_start_time = datetime.now(timezone.utc)
-            result = queue_manager.get_result(job_id, timeout=5)
+            result = queue_manager.get_result(job_id, timeout=wait)
             redis_query_time = (
                 datetime.now(timezone.utc) - redis_start_time
             ).total_seconds()
@@ -752,7 +885,7 @@ def get_result(job_id):
                     )
                     # Success result found, update job status and result
                     Job.update_status(
-                        job_id, "completed", result_json=json.dumps(result)
+                        job_id, "completed", result_json=orjson.dumps(result).decode()
                     )
 
                     # Transform result to match specification format
@@ -800,7 +933,7 @@ def get_result(job_id):
             if job_dict["result_json"]:
                 print(f"💾 [RESULT] Found result in database for job {job_id}")
                 db_start_time = datetime.now(timezone.utc)
-                result = json.loads(job_dict["result_json"])
+                result = orjson.loads(job_dict["result_json"])
                 db_query_time = (
                     datetime.now(timezone.utc) - db_start_time
                 ).total_seconds()
@@ -825,7 +958,7 @@ def get_result(job_id):
                     print(f"📝 [RESULT] Found result in Redis, updating database...")
                     # Update database with result from Redis
                     Job.update_status(
-                        job_id, "completed", result_json=json.dumps(result)
+                        job_id, "completed", result_json=orjson.dumps(result).decode()
                     )
                 else:
                     print(
@@ -942,4 +1075,7 @@ if __name__ == "__main__":
         pass
 
     init_db()
+    # Start a PDF worker process now so the first upload does not pay for the
+    # MuPDF import
+    start_pdf_workers()
     app.run(debug=True, host="0.0.0.0", port=5000, use_reloader=False)
@@ -17,6 +17,7 @@ from src.models.database import Document, Job
 from src.core.rag_engine import ingest_text, query, has_id, ingest_file
 from src.core.ai_engine import evaluate_cv, evaluate_project, synthesize_overall
 from src.workers.tasks import run_job_task
+from src.core.document_text import read_document_text
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -31,24 +32,10 @@ CASE_STUDY_PATH = os.path.join(os.getcwd(), "docs", "case_study_text.txt")
 upload_queue = queue.Queue(maxsize=100)
 
 
-def _read_pdf_text(path):
-    """Extract text from PDF file with fallback"""
-    try:
-        from PyPDF2 import PdfReader
-        reader = PdfReader(path)
-        return "\n\n".join((p.extract_text() or "") for p in reader.pages)
-    except Exception:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
-        except Exception:
-            return ""
-
-
 def _process_uploaded_file(doc_id, path, doc_type):
     """Process uploaded file and ingest to RAG"""
     try:
-        text = _read_pdf_text(path)
+        text = read_document_text(path)
         sidecar = f"{path}.txt"
         with open(sidecar, "w", encoding="utf-8") as f:
             f.write(text or "")
@@ -606,10 +606,10 @@ def evaluate_cv(
             "AI services not available. Please ensure Instructor, Google Generative AI, and GEMINI_API_KEY are properly configured."
         )
 
-    if not cv_text.strip():
+    if not cv_text or cv_text.isspace():
         raise ValueError("CV text cannot be empty")
 
-    if not job_title.strip():
+    if not job_title or job_title.isspace():
         raise ValueError("Job title cannot be empty")
 
     def _evaluate_cv_internal():
@@ -688,29 +688,29 @@ def evaluate_project(
             "AI services not available. Please ensure Instructor, Google Generative AI, and GEMINI_API_KEY are properly configured."
         )
 
-    if not report_text.strip():
+    if not report_text or report_text.isspace():
         raise ValueError("Report text cannot be empty")
 
-    if not case_brief_text.strip():
+    if not case_brief_text or case_brief_text.isspace():
         raise ValueError("Case brief text cannot be empty")
 
     def _evaluate_project_internal():
         client = _client()
         rag_context = "\n\n".join(context_snippets or [])
 
+        # Static part first (role, case brief, rubric, instructions) so every job shares
+        # the same prompt prefix and Gemini's implicit prefix caching can reuse it;
+        # per-job RAG context and the report come last
         prompt = f"""
 Anda adalah evaluator Project Report ahli.
 
-KONTEKS SISTEM (RAG-retrieved dari Case Study Brief dan Project Scoring Rubrics):
-{rag_context}
-
 CASE STUDY BRIEF (Requirements yang harus dipenuhi):
 ---
 {case_brief_text}
 ---
 
 TUGAS EVALUASI PROJECT:
-1. Parse Project Report kandidat berikut dan evaluasi berdasarkan 5 parameter (skor 1-5):
+1. Parse Project Report kandidat dan evaluasi berdasarkan 5 parameter (skor 1-5):
    - Correctness: meets requirements (prompt design, chaining, RAG, handling errors)
    - Code Quality: clean, modular, testable
    - Resilience: handles failures, retries
@@ -721,16 +721,19 @@ TUGAS EVALUASI PROJECT:
 
 3. Berikan project_feedback yang komprehensif
 
-PROJECT REPORT KANDIDAT:
----
-{report_text}
----
-
 INSTRUKSI:
 - Evaluasi seberapa baik project memenuhi requirements di Case Study Brief
 - Gunakan konteks sistem untuk scoring guidelines
 - Berikan skor yang konsisten dan objektif (1-5)
 - Format response harus sesuai ProjectResult model
+
+KONTEKS SISTEM (RAG-retrieved dari Case Study Brief dan Project Scoring Rubrics):
+{rag_context}
+
+PROJECT REPORT KANDIDAT:
+---
+{report_text}
+---
 """
         resp = client.create(
             messages=[{"role": "user", "content": prompt}],
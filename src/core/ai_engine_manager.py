@@ -3,7 +3,10 @@ AI Engine Manager - Manages between Instructor and Pydantic-AI implementations
 """
 
 import os
+import inspect
+import hashlib
 import logging
+from functools import lru_cache
 from typing import Optional, List, Any
 from enum import Enum
 
@@ -61,6 +64,13 @@ except ImportError as e:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
+def _module_fingerprint(func) -> str:
+    """Short hash of the source module of `func` (prompts, model name, result models)"""
+    source = inspect.getsource(inspect.getmodule(func))
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
 class AIEngineType(Enum):
     INSTRUCTOR = "instructor"
     PYDANTIC_AI = "pydantic_ai"
@@ -130,6 +140,21 @@ class AIEngineManager:
         """Check if any AI engine is available"""
         return self.current_engine is not None
 
+    def get_result_model(self, kind: str):
+        """Result model class ("cv" or "project") returned by the current engine"""
+        if self.current_engine == AIEngineType.PYDANTIC_AI and PYDANTIC_AI_IMPORT_SUCCESS:
+            return {"cv": PydanticAICVResult, "project": PydanticAIProjectResult}[kind]
+        return {"cv": CVResult, "project": ProjectResult}[kind]
+
+    def get_cache_version(self) -> str:
+        """Current engine plus a hash of its module, so cached evaluations are
+        invalidated when the engine, its prompts or its model change"""
+        if self.current_engine == AIEngineType.PYDANTIC_AI and PYDANTIC_AI_IMPORT_SUCCESS:
+            evaluate = pydantic_ai_evaluate_cv
+        else:
+            evaluate = instructor_evaluate_cv
+        return f"{self.get_current_engine()}-{_module_fingerprint(evaluate)}"
+
     def evaluate_cv(self, cv_text: str, job_title: str, context_snippets: Optional[List[str]] = None):
         """Evaluate CV using the current engine"""
         if not self.is_available():
@@ -249,6 +274,16 @@ def synthesize_overall(cv_result, project_result):
     return get_engine_manager().synthesize_overall(cv_result, project_result)
 
 
+def get_result_model(kind: str):
+    """Result model class ("cv" or "project") returned by the current engine"""
+    return get_engine_manager().get_result_model(kind)
+
+
+def get_cache_version() -> str:
+    """Version tag for cached evaluations of the current engine"""
+    return get_engine_manager().get_cache_version()
+
+
 def available() -> bool:
     """Check if any AI engine is available"""
     return get_engine_manager().is_available()
@@ -334,10 +334,10 @@ async def evaluate_cv(
             "AI services not available. Please ensure Pydantic-AI, Google Generative AI, and GEMINI_API_KEY are properly configured."
         )
 
-    if not cv_text.strip():
+    if not cv_text or cv_text.isspace():
         raise ValueError("CV text cannot be empty")
 
-    if not job_title.strip():
+    if not job_title or job_title.isspace():
         raise ValueError("Job title cannot be empty")
 
     try:
@@ -386,10 +386,10 @@ async def evaluate_project(
             "AI services not available. Please ensure Pydantic-AI, Google Generative AI, and GEMINI_API_KEY are properly configured."
         )
 
-    if not report_text.strip():
+    if not report_text or report_text.isspace():
         raise ValueError("Report text cannot be empty")
 
-    if not case_brief_text.strip():
+    if not case_brief_text or case_brief_text.isspace():
         raise ValueError("Case brief text cannot be empty")
 
     try:
@@ -0,0 +1,196 @@
+"""
+Document text extraction untuk uploads (PDF via PyMuPDF, fallback PyPDF2, atau plain text)
+Shared by the Flask app, the evaluation module, the RAG engine and the SimpleWorker
+"""
+
+import os
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def read_text_file(path):
+    """Read a plain text / markdown file"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except Exception:
+        return ""
+
+
+# Extracted text shorter than this is treated as unparseable; such jobs fail
+# without calling the LLM
+MIN_EXTRACTED_TEXT_CHARS = 50
+
+# PDFs with more pages than this are split into page ranges across processes
+PARALLEL_PDF_PAGE_THRESHOLD = 20
+
+# MuPDF is not thread-safe and holds the GIL while parsing: short PDFs are parsed
+# in-process one at a time, long ones are split into page ranges across processes
+_fitz_lock = threading.Lock()
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Open documents kept per process (pool workers included), keyed by (path, mtime_ns),
+# so re-evaluating the same CV does not rebuild MuPDF's xref table
+PDF_DOCUMENT_CACHE_SIZE = 32
+_open_documents = OrderedDict()
+
+
+def _get_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            # Workers fork from a single-threaded forkserver, not from this
+            # (multi-threaded) process; only this module is preloaded there
+            ctx = multiprocessing.get_context("forkserver")
+            ctx.set_forkserver_preload([__name__])
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=ctx,
+                initializer=warm_up_pdf_backend,
+            )
+        return _pdf_pool
+
+
+def _open_pdf(path):
+    """Open a PDF through the per-process LRU, closing evicted documents; hold _fitz_lock"""
+    import fitz  # PyMuPDF
+
+    key = (path, os.stat(path).st_mtime_ns)
+    doc = _open_documents.get(key)
+    if doc is not None:
+        _open_documents.move_to_end(key)
+        return doc
+
+    # The file changed on disk - drop handles to older versions
+    for stale_key in [k for k in _open_documents if k[0] == path]:
+        _open_documents.pop(stale_key).close()
+
+    doc = fitz.open(path)
+    _open_documents[key] = doc
+    while len(_open_documents) > PDF_DOCUMENT_CACHE_SIZE:
+        _open_documents.popitem(last=False)[1].close()
+    return doc
+
+
+def _page_texts(doc, start, stop):
+    import fitz  # PyMuPDF
+
+    return [
+        doc.load_page(i).get_text("text", flags=fitz.TEXTFLAGS_TEXT)
+        for i in range(start, stop)
+    ]
+
+
+def _extract_pdf_page_range(path, start, stop):
+    """Extract pages [start, stop) - module-level so it can run in a worker process"""
+    with _fitz_lock:
+        return _page_texts(_open_pdf(path), start, stop)
+
+
+def _extract_pdf_pages_fitz(path):
+    """Extract all page texts: in-process for short PDFs, across the process pool for long ones"""
+    with _fitz_lock:
+        doc = _open_pdf(path)
+        page_count = doc.page_count
+        # Most CVs / reports are a few pages, not worth the IPC round-trip.
+        # Daemonic processes (e.g. Celery prefork children) cannot start a pool
+        if page_count <= PARALLEL_PDF_PAGE_THRESHOLD or multiprocessing.current_process().daemon:
+            return _page_texts(doc, 0, page_count)
+
+    step = -(-page_count // (os.cpu_count() or 1))  # ceil division
+    try:
+        pool = _get_pdf_pool()
+        futures = [
+            pool.submit(_extract_pdf_page_range, path, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool:
+        # A crashed worker breaks the pool: drop it and parse in-process this time
+        global _pdf_pool
+        with _pdf_pool_lock:
+            _pdf_pool = None
+        return _extract_pdf_page_range(path, 0, page_count)
+
+
+def start_pdf_workers():
+    """Warm up MuPDF here and start a PDF worker process before the first upload / job"""
+    warm_up_pdf_backend()
+    if not multiprocessing.current_process().daemon:
+        _get_pdf_pool().submit(warm_up_pdf_backend)
+
+
+def warm_up_pdf_backend():
+    """Import and initialise PyMuPDF up front so the first PDF job does not pay for it"""
+    try:
+        import fitz  # PyMuPDF
+
+        fitz.open().close()  # empty in-memory document forces MuPDF initialisation
+    except Exception:
+        pass
+
+
+def is_pdf(path):
+    """Extension check used to pick the reader"""
+    return path[-4:].lower() == ".pdf"
+
+
+def read_document_text(path):
+    """Read text from PDF (PyMuPDF, PyPDF2 fallback) or markdown file"""
+    if is_pdf(path):
+        return read_pdf_text(path)
+    return read_text_file(path)
+
+
+def _join_pages(parts):
+    # Blank / image-only pages contribute nothing to the joined text
+    return "\n".join(part for part in parts if part and not part.isspace()).strip()
+
+
+def extract_pdf_text(path):
+    """Extract text from a PDF (PyMuPDF, PyPDF2 fallback); raises if both backends fail"""
+    try:
+        parts = _extract_pdf_pages_fitz(path)
+    except Exception:
+        # Fallback backend if MuPDF is missing or cannot parse the file
+        from PyPDF2 import PdfReader
+
+        parts = [page.extract_text() for page in PdfReader(path).pages]
+    return _join_pages(parts)
+
+
+def read_pdf_text(path):
+    """Read text from a PDF (PyMuPDF, PyPDF2 fallback, then as plain text)"""
+    try:
+        return extract_pdf_text(path)
+    except Exception:
+        return read_text_file(path)
+
+
+def read_sidecar(path):
+    """Read an extracted-text sidecar whole: one binary read and a single decode"""
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8", errors="replace")
+    # Same newlines as text-mode open(), so Windows uploads hit the same cache keys
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+# Static text files (case study brief) cached per path, invalidated by mtime
+_text_cache = {}
+
+
+def read_cached_text(path):
+    """Read a rarely-changing text file, re-reading only when its mtime changes"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _text_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    text = read_sidecar(path)
+    _text_cache[path] = (mtime, text)
+    return text
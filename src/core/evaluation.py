@@ -3,13 +3,21 @@ Evaluation Module
 Contains core evaluation logic moved from workers.py
 """
 
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 
 # Import from restructured modules
 from src.models.database import Job, Document
-from src.core.rag_engine import query
+from src.core.rag_engine import REPORT_QUERY, embed, query
 from src.core.ai_engine import evaluate_cv, evaluate_project, synthesize_overall
+from src.core.document_text import (
+    MIN_EXTRACTED_TEXT_CHARS,
+    read_cached_text,
+    read_document_text,
+    read_sidecar,
+)
 
 # Constants
 CASE_STUDY_PATH = os.path.join(
@@ -17,19 +25,8 @@ CASE_STUDY_PATH = os.path.join(
 )
 
 
-def _read_pdf_text(path):
-    """Read text from PDF or markdown file"""
-    try:
-        from PyPDF2 import PdfReader
-
-        reader = PdfReader(path)
-        return "\n\n".join((p.extract_text() or "") for p in reader.pages)
-    except Exception:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
-        except Exception:
-            return ""
+# Shared pool for the concurrent RAG queries and LLM calls in evaluate_candidate_job
+_executor = ThreadPoolExecutor(max_workers=4)
 
 
 def evaluate_candidate_job(job_id):
@@ -53,64 +50,70 @@ def evaluate_candidate_job(job_id):
             cv_doc = Document.get_by_id(job["cv_id"])
             if cv_doc:
                 cv_sidecar = f"{cv_doc['path']}.txt"
-                if os.path.exists(cv_sidecar):
-                    with open(cv_sidecar, "r", encoding="utf-8") as f:
-                        cv_text = f.read()
-                else:
-                    cv_text = _read_pdf_text(cv_doc["path"])
+                try:
+                    cv_text = read_sidecar(cv_sidecar)
+                except OSError:
+                    cv_text = read_document_text(cv_doc["path"])
 
         # Get Report document
         if job["report_id"]:
             report_doc = Document.get_by_id(job["report_id"])
             if report_doc:
                 report_sidecar = f"{report_doc['path']}.txt"
-                if os.path.exists(report_sidecar):
-                    with open(report_sidecar, "r", encoding="utf-8") as f:
-                        report_text = f.read()
-                else:
-                    report_text = _read_pdf_text(report_doc["path"])
+                try:
+                    report_text = read_sidecar(report_sidecar)
+                except OSError:
+                    report_text = read_document_text(report_doc["path"])
+
+        # Nothing to evaluate: fail fast instead of spending LLM calls on it
+        if (
+            len(cv_text.strip()) < MIN_EXTRACTED_TEXT_CHARS
+            or len(report_text.strip()) < MIN_EXTRACTED_TEXT_CHARS
+        ):
+            Job.update_status(job_id, "failed", error_message="insufficient text extracted")
+            return False, "Evaluation failed: insufficient text extracted"
 
         # Ensure case study brief is available for context
-        case_text = ""
         try:
-            with open(CASE_STUDY_PATH, "r", encoding="utf-8") as f:
-                case_text = f.read()
+            case_text = read_cached_text(CASE_STUDY_PATH)
         except FileNotFoundError:
             case_text = ""
 
-        # RAG retrieval: gunakan API rag.query yang tersedia
+        # RAG retrieval: gunakan API rag.query yang tersedia. The two queries
+        # (and later the two evaluations) are independent and run concurrently.
+        cv_query = _executor.submit(query, job["job_title"] or "", n_results=3)
+        report_query = _executor.submit(
+            lambda: query(REPORT_QUERY, n_results=3, query_embedding=embed(REPORT_QUERY))
+        )
         try:
-            cv_snippets = [
-                d["document"] for d in query(job["job_title"] or "", n_results=3)
-            ]
+            cv_snippets = [d["document"] for d in cv_query.result()]
         except Exception:
             cv_snippets = []
         try:
-            report_snippets = [
-                d["document"]
-                for d in query(
-                    "project scoring prompt chaining RAG error handling", n_results=3
-                )
-            ]
+            report_snippets = [d["document"] for d in report_query.result()]
         except Exception:
             report_snippets = []
 
         # LLM evaluation with built-in fallback mechanism
         try:
-            cv_res = evaluate_cv(
+            cv_future = _executor.submit(
+                evaluate_cv,
                 cv_text=cv_text,
                 job_title=job["job_title"],
                 context_snippets=cv_snippets,
             )
-            proj_res = evaluate_project(
+            proj_future = _executor.submit(
+                evaluate_project,
                 report_text=report_text,
                 case_brief_text=case_text,
                 context_snippets=report_snippets,
             )
+            cv_res = cv_future.result()
+            proj_res = proj_future.result()
             overall_res = synthesize_overall(cv=cv_res, pr=proj_res)
             result = overall_res.dict()
 
-            Job.update_status(job_id, "completed", result_json=json.dumps(result))
+            Job.update_status(job_id, "completed", result_json=orjson.dumps(result).decode())
             return True, "Evaluation completed successfully"
 
         except Exception as e:
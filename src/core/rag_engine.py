@@ -3,7 +3,11 @@ import warnings
 import time
 import random
 import logging
-from typing import List, Dict, Any
+import hashlib
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+
+from src.core.document_text import read_pdf_text
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -132,6 +136,114 @@ except Exception as e:
     raise RuntimeError(f"ChromaDB initialization failed after multiple attempts: {str(e)}")
 
 
+# Cache hasil evaluasi LLM: exact match (SHA-256 dari input) selalu aktif; semantic
+# match (cosine similarity) hanya jika EVAL_SEMANTIC_CACHE_THRESHOLD di-set, mis. 0.92.
+# Default embedder hanya melihat ~256 token pertama, jadi semantic match opt-in.
+_semantic_threshold = os.getenv("EVAL_SEMANTIC_CACHE_THRESHOLD")
+EVAL_SEMANTIC_CACHE_THRESHOLD = float(_semantic_threshold) if _semantic_threshold else None
+# Entri lebih tua dari ini diabaikan (dan dihapus secara berkala), default 7 hari
+EVAL_CACHE_TTL_SECONDS = int(os.getenv("EVAL_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+_EVAL_CACHE_PRUNE_INTERVAL = 3600
+_eval_cache_last_prune = 0.0
+
+try:
+    _eval_cache = _client.get_or_create_collection(
+        name="evaluation_cache",
+        embedding_function=_embedder,
+        metadata={"hnsw:space": "cosine"},
+    )
+except Exception as e:
+    logger.warning(f"Evaluation cache unavailable: {e}")
+    _eval_cache = None
+
+
+def _eval_cache_id(kind: str, key_text: str, version: str) -> str:
+    return f"{kind}:{version}:{hashlib.sha256(key_text.encode('utf-8')).hexdigest()}"
+
+
+def get_cached_evaluation(kind: str, key_text: str, version: str) -> str | None:
+    """Ambil result_json evaluasi sebelumnya untuk input yang sama (atau cukup mirip).
+
+    `version` mengidentifikasi engine, prompt dan model; hasil dari versi lain atau
+    yang lebih tua dari EVAL_CACHE_TTL_SECONDS tidak dipakai.
+    """
+    if _eval_cache is None or not key_text:
+        return None
+    min_created_at = time.time() - EVAL_CACHE_TTL_SECONDS
+    try:
+        res = _eval_cache.get(ids=[_eval_cache_id(kind, key_text, version)], include=["metadatas"])
+        if res and res.get("ids"):
+            metadata = res["metadatas"][0]
+            if metadata.get("created_at", 0) >= min_created_at:
+                return metadata["result_json"]
+
+        if EVAL_SEMANTIC_CACHE_THRESHOLD is None:
+            return None
+        res = _eval_cache.query(
+            query_texts=[key_text],
+            n_results=1,
+            # Entries stored while semantic matching was off carry a placeholder vector
+            where={
+                "$and": [
+                    {"kind": kind},
+                    {"version": version},
+                    {"embedded": True},
+                    {"created_at": {"$gte": min_created_at}},
+                ]
+            },
+            include=["metadatas", "distances"],
+        )
+        distances = res.get("distances", [[]])[0]
+        if distances and 1 - distances[0] >= EVAL_SEMANTIC_CACHE_THRESHOLD:
+            return res["metadatas"][0][0]["result_json"]
+    except Exception as e:
+        logger.warning(f"Evaluation cache lookup failed: {e}")
+    return None
+
+
+def _placeholder_embedding() -> List[float]:
+    # Unit vector with the embedder's dimension (probed once via the cached embed())
+    dim = len(embed("evaluation cache placeholder"))
+    return [1.0] + [0.0] * (dim - 1)
+
+
+def _prune_eval_cache(now: float) -> None:
+    # Hapus entri kedaluwarsa paling sering sekali per _EVAL_CACHE_PRUNE_INTERVAL
+    global _eval_cache_last_prune
+    if now - _eval_cache_last_prune < _EVAL_CACHE_PRUNE_INTERVAL:
+        return
+    _eval_cache_last_prune = now
+    _eval_cache.delete(where={"created_at": {"$lt": now - EVAL_CACHE_TTL_SECONDS}})
+
+
+def cache_evaluation(kind: str, key_text: str, result_json: str, version: str) -> None:
+    """Simpan result_json evaluasi untuk input ini di bawah `version` engine saat ini.
+
+    Tanpa EVAL_SEMANTIC_CACHE_THRESHOLD hanya exact match yang dipakai, jadi key_text
+    tidak di-embed dan tidak disimpan.
+    """
+    if _eval_cache is None or not key_text:
+        return
+    now = time.time()
+    metadata = {"kind": kind, "version": version, "created_at": now, "result_json": result_json}
+    try:
+        if EVAL_SEMANTIC_CACHE_THRESHOLD is None:
+            _eval_cache.upsert(
+                ids=[_eval_cache_id(kind, key_text, version)],
+                embeddings=[_placeholder_embedding()],
+                metadatas=[{**metadata, "embedded": False}],
+            )
+        else:
+            _eval_cache.upsert(
+                ids=[_eval_cache_id(kind, key_text, version)],
+                documents=[key_text],
+                metadatas=[{**metadata, "embedded": True}],
+            )
+        _prune_eval_cache(now)
+    except Exception as e:
+        logger.warning(f"Evaluation cache store failed: {e}")
+
+
 def ingest_text(doc_id: str, text: str, metadata: Dict[str, Any] | None = None) -> None:
     """Ingest plain text ke koleksi Chroma dengan id unik dan retry mechanism."""
     if not text:
@@ -144,6 +256,23 @@ def ingest_text(doc_id: str, text: str, metadata: Dict[str, Any] | None = None)
     return _rag_retry_with_backoff(_ingest_operation, max_retries=3, base_delay=0.8)
 
 
+def ingest_batch(items: List[Tuple[str, str, Dict[str, Any] | None]]) -> None:
+    """Ingest banyak (doc_id, text, metadata) sekaligus dalam satu Chroma add call."""
+    items = [(doc_id, text, metadata) for doc_id, text, metadata in items if text]
+    if not items:
+        return
+
+    def _ingest_operation():
+        _collection.add(
+            documents=[text for _, text, _ in items],
+            metadatas=[metadata or {} for _, _, metadata in items],
+            ids=[doc_id for doc_id, _, _ in items],
+        )
+        return True
+
+    return _rag_retry_with_backoff(_ingest_operation, max_retries=3, base_delay=0.8)
+
+
 def ingest_file(
     path: str, doc_type: str | None = None, title: str | None = None
 ) -> str:
@@ -151,40 +280,9 @@ def ingest_file(
     text = ""
     try:
         if path.lower().endswith(".pdf"):
-            # Use PyMuPDF for better PDF reading (same as worker)
-            try:
-                import fitz  # PyMuPDF
-
-                doc = fitz.open(path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                print(
-                    f"✅ RAG Engine: Successfully read PDF with PyMuPDF: {len(text)} characters"
-                )
-            except ImportError:
-                print(
-                    "⚠️  RAG Engine: PyMuPDF (fitz) not available, trying PyPDF2 fallback"
-                )
-                # Fallback to PyPDF2 if available
-                try:
-                    from PyPDF2 import PdfReader
-
-                    reader = PdfReader(path)
-                    text = "\n\n".join((p.extract_text() or "") for p in reader.pages)
-                    print(
-                        f"✅ RAG Engine: Fallback to PyPDF2 successful: {len(text)} characters"
-                    )
-                except ImportError:
-                    print("❌ RAG Engine: PyPDF2 also not available")
-                    text = ""
-                except Exception as e:
-                    print(f"❌ RAG Engine: PyPDF2 reading failed: {e}")
-                    text = ""
-            except Exception as e:
-                print(f"❌ RAG Engine: Error reading PDF with PyMuPDF {path}: {e}")
-                text = ""
+            # Same extraction as the upload path and the worker
+            text = read_pdf_text(path)
+            print(f"✅ RAG Engine: Successfully read PDF: {len(text)} characters")
         else:
             # Read as text file
             with open(path, "r", encoding="utf-8") as f:
@@ -220,13 +318,31 @@ def has_id(doc_id: str) -> bool:
         return False
 
 
-def query(query_text: str, n_results: int = 5) -> List[Dict[str, Any]]:
-    """Query dokumen relevan dari koleksi dengan retry mechanism."""
+# Query tetap untuk retrieval konteks project report (rubric / case brief)
+REPORT_QUERY = "project scoring prompt chaining RAG error handling"
+
+
+@lru_cache(maxsize=32)
+def embed(text: str):
+    """Embedding untuk query text yang sering dipakai; hasilnya di-cache per text."""
+    return _embedder([text])[0]
+
+
+def query(
+    query_text: str, n_results: int = 5, query_embedding=None
+) -> List[Dict[str, Any]]:
+    """Query dokumen relevan dari koleksi dengan retry mechanism.
+
+    query_embedding (opsional) dipakai langsung sehingga query_text tidak di-embed ulang.
+    """
     if not query_text:
         return []
 
     def _query_operation():
-        res = _collection.query(query_texts=[query_text], n_results=n_results)
+        if query_embedding is not None:
+            res = _collection.query(query_embeddings=[query_embedding], n_results=n_results)
+        else:
+            res = _collection.query(query_texts=[query_text], n_results=n_results)
         docs = []
         for i, d in enumerate(res.get("documents", [[]])[0]):
             docs.append(
@@ -3,6 +3,8 @@ import os
 import time
 import random
 import logging
+import queue
+import threading
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -67,17 +69,52 @@ def _retry_with_backoff(func, *args, max_retries=3, base_delay=0.5, **kwargs):
     raise RuntimeError(f"Database operation failed after {max_retries} retries. Last error: {last_exception}")
 
 
+class _ThreadConnection(sqlite3.Connection):
+    """Connection yang di-reuse per thread: close() hanya rollback transaksi yang terbuka"""
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+
+    def close_for_real(self):
+        super().close()
+
+
+# One SQLite connection per thread, reused across model calls
+_local = threading.local()
+
+
 def get_db_connection():
-    """Get database connection with retry mechanism"""
+    """Get this thread's database connection (created with retry mechanism on first use)"""
+    db_path = os.path.join(os.getcwd(), "database.db")
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.path == db_path:
+        # Model methods check out the connection before writing, so a transaction
+        # still open here was left by a call that raised before close(): discard it
+        # rather than letting this caller commit someone else's partial write
+        if conn.in_transaction:
+            conn.rollback()
+        return conn
+
     def _create_connection():
-        db_path = os.path.join(os.getcwd(), "database.db")
-        conn = sqlite3.connect(db_path, timeout=30.0)  # Increased timeout
+        conn = sqlite3.connect(db_path, timeout=30.0, factory=_ThreadConnection)  # Increased timeout
         conn.row_factory = sqlite3.Row
         # Enable WAL mode for better concurrent access
         conn.execute("PRAGMA journal_mode=WAL")
         return conn
 
-    return _retry_with_backoff(_create_connection, max_retries=5, base_delay=0.2)
+    close_db_connection()
+    _local.conn = _retry_with_backoff(_create_connection, max_retries=5, base_delay=0.2)
+    _local.path = db_path
+    return _local.conn
+
+
+def close_db_connection():
+    """Close this thread's cached database connection, if any"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        conn.close_for_real()
 
 
 def init_db():
@@ -470,6 +507,38 @@ class Job:
         conn.close()
         return row
 
+    @staticmethod
+    def get_with_documents(job_id, mark_processing=False):
+        """Job row plus cv_path / report_path dalam satu query (JOIN ke documents).
+
+        Dengan mark_processing=True status di-set 'processing' dalam transaksi yang sama.
+        """
+        def _get_operation():
+            conn = get_db_connection()
+            try:
+                if mark_processing:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                        ("processing", job_id),
+                    )
+                row = conn.execute(
+                    """
+                    SELECT j.*, cv.path AS cv_path, r.path AS report_path
+                    FROM jobs j
+                    LEFT JOIN documents cv ON cv.id = j.cv_id
+                    LEFT JOIN documents r ON r.id = j.report_id
+                    WHERE j.id = ?
+                    """,
+                    (job_id,),
+                ).fetchone()
+                if mark_processing:
+                    conn.commit()
+                return row
+            finally:
+                conn.close()
+
+        return _retry_with_backoff(_get_operation, max_retries=4, base_delay=0.3)
+
     @staticmethod
     def update_status(job_id, status, result_json=None, error_message=None):
         """Update job status with retry mechanism for critical operations"""
@@ -487,6 +556,33 @@ class Job:
 
         return _retry_with_backoff(_update_operation, max_retries=4, base_delay=0.3)
 
+    @staticmethod
+    def update_status_batch(updates):
+        """Apply many (job_id, status, result_json, error_message) updates in one transaction.
+
+        None keeps the stored result_json / error_message, so a late status-only
+        update never wipes a result that was already saved.
+        """
+        params = [
+            (status, result_json, error_message, job_id)
+            for job_id, status, result_json, error_message in updates
+        ]
+
+        def _update_operation():
+            conn = get_db_connection()
+            try:
+                conn.executemany(
+                    "UPDATE jobs SET status = ?, result_json = COALESCE(?, result_json), "
+                    "error_message = COALESCE(?, error_message), updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                    params,
+                )
+                conn.commit()
+                return True
+            finally:
+                conn.close()
+
+        return _retry_with_backoff(_update_operation, max_retries=4, base_delay=0.3)
+
     @staticmethod
     def count():
         """Count total jobs"""
@@ -505,3 +601,47 @@ class Job:
         ).fetchall()
         conn.close()
         return jobs
+
+
+class StatusWriter:
+    """Background writer yang mengumpulkan job status updates menjadi batch write"""
+
+    def __init__(self, max_batch=100, max_wait=0.05):
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.q = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._loop, name="status-writer", daemon=True
+        )
+        self._thread.start()
+
+    def enqueue(self, job_id, status, result_json=None, error_message=None):
+        """Queue a status update; writes preserve enqueue order"""
+        self.q.put((job_id, status, result_json, error_message))
+
+    def flush(self):
+        """Block until every queued update has been written"""
+        self.q.join()
+
+    def _loop(self):
+        while True:
+            batch = [self.q.get()]
+
+            # Coalesce whatever arrives within max_wait, up to max_batch updates
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                Job.update_status_batch(batch)
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} job status update(s): {e}")
+            finally:
+                for _ in batch:
+                    self.q.task_done()
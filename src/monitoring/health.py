@@ -5,8 +5,10 @@ Provides comprehensive health monitoring for the HR service
 
 import os
 import time
+import threading
+from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 # Optional psutil import with fallback
 try:
@@ -128,8 +130,84 @@ def check_rag_engine_health() -> Dict[str, Any]:
         }
 
 
+# Interval (seconds) between background refreshes of the system snapshot
+SYSTEM_SNAPSHOT_INTERVAL = 2.0
+
+
+@dataclass(frozen=True)
+class _SystemSnapshot:
+    """Point-in-time system resource readings"""
+    cpu_percent: float
+    memory_percent: float
+    memory_available_gb: float
+    disk_percent: float
+    disk_free_gb: float
+
+
+# (snapshot, error) swapped in one assignment so readers never mix a fresh error
+# with a stale snapshot; on failure the last good snapshot is dropped
+_snapshot_state: Tuple[Optional[_SystemSnapshot], Optional[str]] = (None, None)
+_snapshot_lock = threading.Lock()
+_snapshot_thread: Optional[threading.Thread] = None
+
+
+def _take_system_snapshot() -> _SystemSnapshot:
+    """Read CPU, memory and disk usage from psutil"""
+    # interval=None compares against the previous call instead of blocking
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+
+    return _SystemSnapshot(
+        cpu_percent=round(cpu_percent, 2),
+        memory_percent=round(memory.percent, 2),
+        memory_available_gb=round(memory.available / (1024**3), 2),
+        disk_percent=round(disk.percent, 2),
+        disk_free_gb=round(disk.free / (1024**3), 2)
+    )
+
+
+def _refresh_system_snapshot() -> None:
+    """Refresh the cached snapshot, recording the error if psutil fails"""
+    global _snapshot_state
+    try:
+        _snapshot_state = (_take_system_snapshot(), None)
+    except Exception as e:
+        _snapshot_state = (None, str(e))
+
+
+def _snapshot_refresher() -> None:
+    """Background loop keeping the system snapshot fresh"""
+    while True:
+        time.sleep(SYSTEM_SNAPSHOT_INTERVAL)
+        _refresh_system_snapshot()
+
+
+def _ensure_snapshot_refresher() -> None:
+    """Start the background refresher once, priming the first snapshot"""
+    global _snapshot_thread
+    if _snapshot_thread is not None:
+        return
+
+    with _snapshot_lock:
+        if _snapshot_thread is not None:
+            return
+        # psutil's first non-blocking cpu_percent() call always returns 0.0: seed
+        # the counter and let a short window pass before the primed snapshot
+        try:
+            psutil.cpu_percent(interval=None)
+            time.sleep(0.1)
+        except Exception:
+            pass
+        _refresh_system_snapshot()
+        _snapshot_thread = threading.Thread(
+            target=_snapshot_refresher, name="system-snapshot", daemon=True
+        )
+        _snapshot_thread.start()
+
+
 def check_system_resources() -> Dict[str, Any]:
-    """Check system resource usage"""
+    """Check system resource usage from the cached background snapshot"""
     if not psutil:
         return {
             "status": "healthy",
@@ -141,25 +219,17 @@ def check_system_resources() -> Dict[str, Any]:
             "note": "psutil not available"
         }
 
-    try:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+    _ensure_snapshot_refresher()
 
-        return {
-            "status": "healthy",
-            "cpu_percent": round(cpu_percent, 2),
-            "memory_percent": round(memory.percent, 2),
-            "memory_available_gb": round(memory.available / (1024**3), 2),
-            "disk_percent": round(disk.percent, 2),
-            "disk_free_gb": round(disk.free / (1024**3), 2)
-        }
-    except Exception as e:
+    snapshot, error = _snapshot_state
+    if error or snapshot is None:
         return {
             "status": "unhealthy",
-            "error": str(e)
+            "error": error or "System snapshot not available"
         }
 
+    return {"status": "healthy", **asdict(snapshot)}
+
 
 def comprehensive_health_check() -> Dict[str, Any]:
     """Perform comprehensive health check"""
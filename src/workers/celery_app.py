@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 
 def make_celery() -> Celery:
@@ -35,4 +36,12 @@ def make_celery() -> Celery:
     return celery
 
 
-celery = make_celery()
\ No newline at end of file
+celery = make_celery()
+
+
+@worker_process_init.connect
+def _warm_up_pdf_backend(**kwargs):
+    """Load PyMuPDF in each forked worker before it takes its first task"""
+    from src.core.document_text import warm_up_pdf_backend
+
+    warm_up_pdf_backend()
@@ -5,11 +5,15 @@ Menghandle job submission dan result retrieval
 """
 
 import os
-import json
+import time
+import orjson
 import redis
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+# Jobs not finished this many seconds after submission are dropped by the worker
+JOB_MAX_AGE_SECONDS = int(os.getenv('JOB_MAX_AGE_SECONDS', '600'))
+
 class SimpleQueueManager:
     def __init__(self):
         """Initialize queue manager dengan Redis connection"""
@@ -17,8 +21,9 @@ class SimpleQueueManager:
         self.redis_client = redis.from_url(self.redis_url, decode_responses=True)
 
         # Queue names
-        self.queue_name = "evaluation_queue"
+        self.stream_name = "evaluation_stream"
         self.result_prefix = "job_result:"
+        self.done_channel_prefix = "job_done:"
 
     def submit_job(self, job_id: int, cv_id: int, report_id: int, job_title: str) -> bool:
         """Submit job ke queue"""
@@ -29,12 +34,13 @@ class SimpleQueueManager:
                 "report_id": report_id,
                 "job_title": job_title,
                 "submitted_at": datetime.utcnow().isoformat(),
+                "deadline_at": time.time() + JOB_MAX_AGE_SECONDS,
                 "queue_type": "simple_redis_worker"
             }
 
-            # Convert to JSON dan push ke queue
-            job_json = json.dumps(job_data)
-            self.redis_client.lpush(self.queue_name, job_json)
+            # Convert to JSON dan append ke stream (dikonsumsi via consumer group)
+            job_json = orjson.dumps(job_data)
+            self.redis_client.xadd(self.stream_name, {"payload": job_json})
 
             print(f"✅ Job {job_id} submitted to queue successfully")
             return True
@@ -44,38 +50,43 @@ class SimpleQueueManager:
             return False
 
     def get_result(self, job_id: int, timeout: int = 300) -> Optional[Dict[str, Any]]:
-        """Get job result dengan timeout"""
+        """Get job result dengan timeout, menunggu notifikasi job_done dari worker"""
         result_key = f"{self.result_prefix}{job_id}"
+        deadline = time.monotonic() + timeout
 
-        start_time = datetime.utcnow()
-
-        while True:
-            # Check if result exists
-            result_json = self.redis_client.get(result_key)
+        # Subscribe before the first check so a completion in between is not missed
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(f"{self.done_channel_prefix}{job_id}")
 
-            if result_json:
-                try:
-                    result = json.loads(result_json)
-                    print(f"✅ Retrieved result for job {job_id}")
-                    return result
-                except json.JSONDecodeError as e:
-                    print(f"❌ Error decoding result for job {job_id}: {e}")
+        try:
+            while True:
+                # Check if result exists
+                result_json = self.redis_client.get(result_key)
+
+                if result_json:
+                    try:
+                        result = orjson.loads(result_json)
+                        print(f"✅ Retrieved result for job {job_id}")
+                        return result
+                    except orjson.JSONDecodeError as e:
+                        print(f"❌ Error decoding result for job {job_id}: {e}")
+                        return None
+
+                # Check timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"⏰ Timeout waiting for result of job {job_id} after {timeout}s")
                     return None
 
-            # Check timeout
-            elapsed = (datetime.utcnow() - start_time).total_seconds()
-            if elapsed > timeout:
-                print(f"⏰ Timeout waiting for result of job {job_id} after {timeout}s")
-                return None
-
-            # Wait before checking again
-            import time
-            time.sleep(2)
+                # Wake up on the worker's job_done publish (re-check every 2s at most)
+                pubsub.get_message(timeout=min(remaining, 2))
+        finally:
+            pubsub.close()
 
     def get_queue_status(self) -> Dict[str, Any]:
         """Get queue status info"""
         try:
-            queue_length = self.redis_client.llen(self.queue_name)
+            queue_length = self.redis_client.xlen(self.stream_name)
 
             # Get all result keys
             result_keys = self.redis_client.keys(f"{self.result_prefix}*")
@@ -85,7 +96,7 @@ class SimpleQueueManager:
                 "queue_length": queue_length,
                 "active_results": active_results,
                 "redis_url": self.redis_url,
-                "queue_name": self.queue_name,
+                "queue_name": self.stream_name,
                 "timestamp": datetime.utcnow().isoformat()
             }
 
@@ -98,8 +109,8 @@ class SimpleQueueManager:
     def clear_queue(self) -> bool:
         """Clear all jobs from queue"""
         try:
-            self.redis_client.delete(self.queue_name)
-            print(f"✅ Queue {self.queue_name} cleared")
+            self.redis_client.delete(self.stream_name)
+            print(f"✅ Queue {self.stream_name} cleared")
             return True
         except Exception as e:
             print(f"❌ Error clearing queue: {e}")
@@ -5,17 +5,27 @@ Lebih transparan dan mudah di-debug
 """
 
 import os
-import json
 import time
+import socket
 import logging
 import traceback
 import random
+import hashlib
+import threading
+import re
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Union
 
+import orjson
 import redis
-from src.models.database import Job, Document
+from pydantic import BaseModel
+from redis.utils import HIREDIS_AVAILABLE
+from src.models.database import Document, StatusWriter
 from src.core.ai_engine import evaluate_cv, evaluate_project, synthesize_overall
+from src.core.document_text import MIN_EXTRACTED_TEXT_CHARS, extract_pdf_text, start_pdf_workers
+from src.workers.queue_manager import JOB_MAX_AGE_SECONDS
 
 # Setup logging
 logging.basicConfig(
@@ -24,38 +34,256 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Atomically move every job from a legacy LIST queue onto the stream, oldest first
+# (producers LPUSHed, so the oldest job sits at the right end)
+_MIGRATE_LIST_SCRIPT = """
+local moved = 0
+while true do
+    local job = redis.call('RPOP', KEYS[1])
+    if not job then
+        return moved
+    end
+    redis.call('XADD', KEYS[2], '*', 'payload', job)
+    moved = moved + 1
+end
+"""
+
+# Redis connection pools shared by all SimpleWorker instances, keyed by URL
+_REDIS_POOLS: Dict[str, redis.ConnectionPool] = {}
+
+
+def _get_redis_pool(redis_url: str) -> redis.ConnectionPool:
+    """Get (or lazily create) the shared connection pool for a Redis URL"""
+    pool = _REDIS_POOLS.get(redis_url)
+    if pool is None:
+        pool = redis.ConnectionPool.from_url(
+            redis_url,
+            # Values stay bytes end-to-end; orjson reads and writes bytes directly
+            decode_responses=False,
+            max_connections=16,
+            socket_keepalive=True,
+            health_check_interval=30
+        )
+        _REDIS_POOLS[redis_url] = pool
+    return pool
+
+
+# Error substrings (matched against the lower-cased message) that warrant a retry
+RETRYABLE_REDIS_ERROR = re.compile(r"connection|timeout|refused|unreachable")
+RETRYABLE_FILE_ERROR = re.compile(
+    r"permission denied|being used by another process|i/o error|timeout|temporarily unavailable"
+)
+RETRYABLE_JOB_ERROR = re.compile(
+    r"ai services not available|rate limit|timeout|connection|temporarily unavailable"
+    r"|resource exhausted|database|redis"
+)
+
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2^attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _decorrelated_delay(prev_delay: float, base: float, cap: float) -> float:
+    """Decorrelated jitter: uniform(base, prev_delay * 3), capped"""
+    return min(cap, random.uniform(base, prev_delay * 3))
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker rejects a call without attempting it"""
+
+
+class CircuitBreaker:
+    """Thread-safe CLOSED/OPEN/HALF_OPEN circuit breaker for external AI calls"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.recovery_timeout - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Circuit breaker '{self.name}' is open; calls suspended for {remaining:.0f}s"
+                    )
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                # Only a single trial call probes the upstream while half-open
+                if self._trial_in_flight:
+                    raise CircuitOpenError(
+                        f"Circuit breaker '{self.name}' is half-open; trial call in progress"
+                    )
+                self._trial_in_flight = True
+
+    def _on_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit breaker '{self.name}' closed")
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self._trial_in_flight = False
+
+    def _on_failure(self):
+        with self._lock:
+            self.failure_count += 1
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.error(
+                        f"Circuit breaker '{self.name}' opened after {self.failure_count} "
+                        f"consecutive failure(s); failing fast for {self.recovery_timeout:.0f}s"
+                    )
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def call(self, func, *args, **kwargs):
+        """Invoke func through the breaker"""
+        self._before_call()
+        try:
+            result = func(*args, **kwargs)
+        except (ValueError, TypeError):
+            # Invalid input says nothing about upstream health
+            with self._lock:
+                self._trial_in_flight = False
+            raise
+        except Exception:
+            self._on_failure()
+            raise
+        self._on_success()
+        return result
+
+
+class CVSummary(BaseModel):
+    match_rate: float
+    feedback: str
+
+
+class ProjectSummary(BaseModel):
+    score: float
+    feedback: str
+
+
+class OverallSummary(BaseModel):
+    summary: str
+
+
+class ProcessingMetadata(BaseModel):
+    processed_at: str
+    ai_engine_used: bool
+    worker_type: str = "simple_redis_worker"
+
+
+class FinalResult(BaseModel):
+    """Result yang disimpan ke Redis untuk job yang berhasil"""
+    cv_result: CVSummary
+    project_result: ProjectSummary
+    overall_result: OverallSummary
+    processing_metadata: ProcessingMetadata
+
+    @classmethod
+    def from_results(cls, cv_result, project_result, overall_result, ai_engine_used: bool) -> "FinalResult":
+        """Build from AI engine results; they are already validated, so skip re-validation"""
+        return cls.model_construct(
+            cv_result=CVSummary.model_construct(
+                match_rate=cv_result.cv_match_rate,
+                feedback=cv_result.cv_feedback
+            ),
+            project_result=ProjectSummary.model_construct(
+                score=project_result.project_score,
+                feedback=project_result.project_feedback
+            ),
+            overall_result=OverallSummary.model_construct(summary=overall_result.overall_summary),
+            processing_metadata=ProcessingMetadata.model_construct(
+                processed_at=datetime.now(timezone.utc).isoformat(),
+                ai_engine_used=ai_engine_used,
+                worker_type="simple_redis_worker"
+            )
+        )
+
+
 class SimpleWorker:
     def __init__(self):
         """Initialize worker dengan Redis connection"""
         self.redis_url = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+        self._pool = _get_redis_pool(self.redis_url)
         self.redis_client = self._create_redis_connection()
-
-        # Queue names
-        self.queue_name = "evaluation_queue"
+        # Job status updates are written to the database in background batches
+        self.status_writer = StatusWriter()
+
+        # Stream / key names
+        self.stream_name = "evaluation_stream"
+        self.group_name = "evaluation_workers"
+        self.consumer_name = f"{socket.gethostname()}:{os.getpid()}"
+        self.dlq_stream = "evaluation_dlq"
         self.result_prefix = "job_result:"
-
-        logger.info(f"Worker initialized with Redis: {self.redis_url}")
+        self.done_channel_prefix = "job_done:"
+        self.doc_text_prefix = "doc_text:"
+
+        # Pending entries idle longer than this are assumed orphaned by a dead
+        # consumer and reclaimed. Half the job deadline: long enough for a normal
+        # job to finish, short enough that a reclaimed job still has time left
+        # before process_job_with_retry drops it as past deadline_at
+        self.reclaim_idle_ms = JOB_MAX_AGE_SECONDS * 1000 // 2
+
+        # In-flight entries are re-claimed by this consumer well inside the idle
+        # window, so a job that runs long is not mistaken for an orphan
+        self.heartbeat_interval = self.reclaim_idle_ms / 1000 / 3
+
+        # Seconds between XAUTOCLAIM passes, so orphans are picked up within
+        # about 1.5x the idle window even while new work keeps arriving
+        self.reclaim_interval = self.reclaim_idle_ms / 1000 / 2
+
+        # Pre-stream queue keys, drained into the stream once on startup
+        self.legacy_queue = "evaluation_queue"
+        self.legacy_processing_pattern = "processing:*"
+
+        # Seconds between explicit PINGs in the main loop
+        self.ping_interval = 30.0
+
+        # Maximum number of jobs in flight at once; new entries are read as
+        # soon as a slot frees up rather than waiting for a whole batch
+        self.concurrency = max(1, int(os.getenv('WORKER_CONCURRENCY', '4')))
+        self.executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        self._in_flight_ids = set()
+        self._slots = threading.Condition()
+        self._stopping = threading.Event()
+
+        # Fail fast while Gemini is down instead of burning retries on every job
+        self.breaker = CircuitBreaker("gemini", failure_threshold=5, recovery_timeout=60.0)
+
+        logger.info(
+            f"Worker initialized with Redis: {self.redis_url} "
+            f"(parser: {'hiredis' if HIREDIS_AVAILABLE else 'python'})"
+        )
 
     def _create_redis_connection(self):
-        """Create Redis connection with retry mechanism"""
+        """Create Redis client on the shared connection pool with retry mechanism"""
         max_retries = 5
         base_delay = 2.0
 
         for attempt in range(max_retries + 1):
             try:
-                client = redis.from_url(self.redis_url, decode_responses=True)
+                client = redis.Redis(connection_pool=self._pool)
                 # Test connection
                 client.ping()
                 logger.info(f"Redis connection established (attempt {attempt + 1})")
                 return client
             except Exception as e:
-                error_str = str(e).lower()
-                is_retryable = (
-                    "connection" in error_str or
-                    "timeout" in error_str or
-                    "refused" in error_str or
-                    "unreachable" in error_str
-                )
+                is_retryable = bool(RETRYABLE_REDIS_ERROR.search(str(e).lower()))
 
                 if not is_retryable:
                     logger.error(f"Non-retryable Redis error: {e}")
@@ -65,8 +293,7 @@ class SimpleWorker:
                     logger.error(f"Max retries ({max_retries}) reached for Redis connection")
                     raise RuntimeError(f"Failed to connect to Redis after {max_retries} attempts: {str(e)}")
 
-                delay = base_delay * (2 ** attempt) + random.uniform(0.5, 1.5)
-                delay = min(delay, 30)  # Cap at 30 seconds
+                delay = _backoff_delay(attempt, base_delay, 30)  # Cap at 30 seconds
 
                 logger.warning(f"Redis connection failed (attempt {attempt + 1}/{max_retries + 1}), retrying in {delay:.2f}s: {e}")
                 time.sleep(delay)
@@ -79,14 +306,7 @@ class SimpleWorker:
             try:
                 return self._read_file_content(file_path)
             except Exception as e:
-                error_str = str(e).lower()
-                is_retryable = (
-                    "permission denied" in error_str or
-                    "being used by another process" in error_str or
-                    "i/o error" in error_str or
-                    "timeout" in error_str or
-                    "temporarily unavailable" in error_str
-                )
+                is_retryable = bool(RETRYABLE_FILE_ERROR.search(str(e).lower()))
 
                 if not is_retryable:
                     logger.error(f"Non-retryable file reading error: {e}")
@@ -96,48 +316,67 @@ class SimpleWorker:
                     logger.error(f"Max retries ({max_retries}) reached for reading file {file_path}")
                     raise RuntimeError(f"Failed to read file {file_path} after {max_retries} attempts: {str(e)}")
 
-                delay = base_delay * (2 ** attempt) + random.uniform(0.2, 1.0)
-                delay = min(delay, 10)  # Cap at 10 seconds
+                delay = _backoff_delay(attempt, base_delay, 10)  # Cap at 10 seconds
 
                 logger.warning(f"File reading failed (attempt {attempt + 1}/{max_retries + 1}), retrying in {delay:.2f}s: {e}")
                 time.sleep(delay)
 
         return ""
 
+    def _read_file_content_cached(self, file_path: str) -> str:
+        """Read file content via Redis cache keyed by the file's content hash"""
+        try:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        except OSError:
+            # Let the retry path produce the proper error / retry behaviour
+            return self._read_file_content_with_retry(file_path)
+
+        cache_key = f"{self.doc_text_prefix}{digest.hexdigest()}"
+        try:
+            cached = self.redis_client.get(cache_key)
+            if cached is not None:
+                text = cached.decode('utf-8')
+                logger.info(f"Document text cache hit for {file_path}: {len(text)} characters")
+                return text
+        except redis.RedisError as e:
+            logger.warning(f"Document text cache lookup failed: {e}")
+
+        text = self._read_file_content_with_retry(file_path)
+
+        try:
+            self.redis_client.setex(cache_key, 86400, text)  # Expire after 1 day
+        except redis.RedisError as e:
+            logger.warning(f"Document text cache store failed: {e}")
+
+        return text
+
     def _read_file_content(self, file_path: str) -> str:
         """Read content from file (PDF or text)"""
         # Check if file is PDF by extension
         if file_path.lower().endswith('.pdf'):
-            # Use PyMuPDF for better PDF reading
+            # Shared extraction (PyMuPDF in the PDF process pool, PyPDF2 fallback)
             try:
-                import fitz  # PyMuPDF
-                doc = fitz.open(file_path)
-                text = ""
-                for page in doc:
-                    text += page.get_text() + "\n"
-                doc.close()
-                logger.info(f"Successfully read PDF with PyMuPDF: {len(text)} characters")
-                return text.strip()
-            except ImportError:
-                logger.error("PyMuPDF (fitz) not available, falling back to basic reading")
-                # Fallback to PyPDF2 if available
-                try:
-                    from PyPDF2 import PdfReader
-                    reader = PdfReader(file_path)
-                    return "\n\n".join((p.extract_text() or "") for p in reader.pages)
-                except Exception as e:
-                    logger.error(f"PyPDF2 also failed: {e}")
-                    raise RuntimeError(f"Failed to read PDF {file_path}: {str(e)}")
+                text = extract_pdf_text(file_path)
+                logger.info(f"Successfully read PDF: {len(text)} characters")
+                return text
             except Exception as e:
-                logger.error(f"Error reading PDF with PyMuPDF {file_path}: {e}")
+                logger.error(f"Error reading PDF {file_path}: {e}")
                 raise RuntimeError(f"Failed to read PDF {file_path}: {str(e)}")
         else:
             # Read as text file
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    logger.info(f"Successfully read text file: {len(content)} characters")
-                    return content.strip()
+                with open(file_path, 'rb') as f:
+                    if hasattr(os, 'posix_fadvise'):
+                        # Hint the kernel that the whole file is read front to back
+                        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    data = f.read()
+                # Single decode of the whole buffer, no newline translation
+                content = data.decode('utf-8', errors='replace')
+                logger.info(f"Successfully read text file: {len(content)} characters")
+                return content.strip()
             except Exception as e:
                 logger.error(f"Error reading text file {file_path}: {e}")
                 raise RuntimeError(f"Failed to read text file {file_path}: {str(e)}")
@@ -151,25 +390,22 @@ class SimpleWorker:
             logger.error(f"Error checking AI availability: {e}")
             return False
 
-    def process_job_with_retry(self, job_data: Dict[str, Any], max_retries: int = 2) -> Dict[str, Any]:
-        """Process individual job with retry mechanism"""
+    def process_job_with_retry(self, job_data: Dict[str, Any], max_retries: int = 2) -> Union[FinalResult, Dict[str, Any]]:
+        """Process individual job with retry mechanism, bounded by the job's deadline_at"""
+        deadline_at = job_data.get('deadline_at', float('inf'))
         base_delay = 5.0
+        delay = base_delay
 
         for attempt in range(max_retries + 1):
+            # Retry-storm guard: drop jobs past their deadline instead of retrying forever
+            if time.time() > deadline_at:
+                logger.error(f"Job {job_data.get('job_id')} exceeded its deadline, dropping")
+                return self._create_error_result(job_data.get('job_id'), TimeoutError("deadline"), "")
+
             try:
                 return self.process_job(job_data)
             except Exception as e:
-                error_str = str(e).lower()
-                is_retryable = (
-                    "ai services not available" in error_str or
-                    "rate limit" in error_str or
-                    "timeout" in error_str or
-                    "connection" in error_str or
-                    "temporarily unavailable" in error_str or
-                    "resource exhausted" in error_str or
-                    "database" in error_str or
-                    "redis" in error_str
-                )
+                is_retryable = bool(RETRYABLE_JOB_ERROR.search(str(e).lower()))
 
                 if not is_retryable:
                     logger.error(f"Non-retryable job processing error: {e}")
@@ -179,8 +415,8 @@ class SimpleWorker:
                     logger.error(f"Max retries ({max_retries}) reached for job {job_data.get('job_id')}")
                     return self._create_error_result(job_data.get('job_id'), e, f"Failed after {max_retries} retries")
 
-                delay = base_delay * (2 ** attempt) + random.uniform(1.0, 3.0)
-                delay = min(delay, 60)  # Cap at 60 seconds
+                # Decorrelated jitter spreads out workers retrying against rate limits
+                delay = _decorrelated_delay(delay, base_delay, 60)  # Cap at 60 seconds
 
                 logger.warning(f"Job processing failed (attempt {attempt + 1}/{max_retries + 1}), retrying in {delay:.2f}s: {e}")
                 time.sleep(delay)
@@ -188,7 +424,7 @@ class SimpleWorker:
     def _create_error_result(self, job_id: int, error: Exception, trace: str) -> Dict[str, Any]:
         """Create standardized error result"""
         if job_id:
-            Job.update_status(job_id, "failed")
+            self.status_writer.enqueue(job_id, "failed")
 
         return {
             "error": str(error),
@@ -201,7 +437,7 @@ class SimpleWorker:
             }
         }
 
-    def process_job(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+    def process_job(self, job_data: Dict[str, Any]) -> FinalResult:
         """Process individual job"""
         job_id = job_data.get('job_id')
         cv_id = job_data.get('cv_id')
@@ -211,7 +447,7 @@ class SimpleWorker:
         logger.info(f"Processing job {job_id} for CV {cv_id}, Report {report_id}, Title: {job_title}")
 
         # Update job status to processing
-        Job.update_status(job_id, "processing")
+        self.status_writer.enqueue(job_id, "processing")
 
         # Get documents from database
         cv_doc = Document.get_by_id(cv_id)
@@ -232,16 +468,24 @@ class SimpleWorker:
 
         # Read document content from files with retry
         logger.info("Reading CV content from file...")
-        cv_text = self._read_file_content_with_retry(cv_doc['path'])
+        cv_text = self._read_file_content_cached(cv_doc['path'])
         logger.info(f"CV content length: {len(cv_text)} characters")
 
         logger.info("Reading report content from file...")
-        report_text = self._read_file_content_with_retry(report_doc['path'])
+        report_text = self._read_file_content_cached(report_doc['path'])
         logger.info(f"Report content length: {len(report_text)} characters")
 
+        # Unparseable upload: fail without retrying or spending LLM calls on it
+        if (
+            len(cv_text.strip()) < MIN_EXTRACTED_TEXT_CHARS
+            or len(report_text.strip()) < MIN_EXTRACTED_TEXT_CHARS
+        ):
+            raise ValueError("insufficient text extracted")
+
         # Evaluate CV (AI engine already has retry mechanism)
         logger.info("Starting CV evaluation...")
-        cv_result = evaluate_cv(
+        cv_result = self.breaker.call(
+            evaluate_cv,
             cv_text=cv_text,
             job_title=job_title
         )
@@ -249,7 +493,8 @@ class SimpleWorker:
 
         # Evaluate Project (AI engine already has retry mechanism)
         logger.info("Starting project evaluation...")
-        project_result = evaluate_project(
+        project_result = self.breaker.call(
+            evaluate_project,
             report_text=report_text,
             case_brief_text=job_title  # Using job_title as case brief
         )
@@ -257,104 +502,306 @@ class SimpleWorker:
 
         # Synthesize overall result (AI engine already has retry mechanism)
         logger.info("Starting synthesis...")
-        overall_result = synthesize_overall(cv_result, project_result)
+        overall_result = self.breaker.call(synthesize_overall, cv_result, project_result)
         logger.info("Synthesis completed")
 
         # Prepare final result
-        final_result = {
-            "cv_result": {
-                "match_rate": cv_result.cv_match_rate,
-                "feedback": cv_result.cv_feedback
-            },
-            "project_result": {
-                "score": project_result.project_score,
-                "feedback": project_result.project_feedback
-            },
-            "overall_result": {
-                "summary": overall_result.overall_summary
-            },
-            "processing_metadata": {
-                "processed_at": datetime.now(timezone.utc).isoformat(),
-                "ai_engine_used": ai_available,
-                "worker_type": "simple_redis_worker"
-            }
-        }
+        final_result = FinalResult.from_results(cv_result, project_result, overall_result, ai_available)
 
         # Update job status to completed
-        Job.update_status(job_id, "completed")
+        self.status_writer.enqueue(job_id, "completed")
 
         logger.info(f"Job {job_id} completed successfully")
         return final_result
 
-    def save_result(self, job_id: int, result: Dict[str, Any]):
-        """Save job result to Redis"""
+    def save_result(self, job_id: int, result: Union[FinalResult, Dict[str, Any]], msg_id: bytes, job_json: bytes):
+        """Save job result, ack the stream entry and notify waiters in one round-trip"""
         result_key = f"{self.result_prefix}{job_id}"
-        self.redis_client.setex(
-            result_key,
-            3600,  # Expire after 1 hour
-            json.dumps(result)
-        )
+        failed = isinstance(result, dict)  # error results are plain dicts
+        with self.redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(
+                result_key,
+                3600,  # Expire after 1 hour
+                orjson.dumps(result) if failed else result.model_dump_json()
+            )
+            if failed:
+                self._dead_letter(pipe, job_json, result['error'])
+            pipe.xack(self.stream_name, self.group_name, msg_id)
+            pipe.xdel(self.stream_name, msg_id)
+            pipe.publish(f"{self.done_channel_prefix}{job_id}", "1")
+            pipe.execute()
         logger.info(f"Result saved for job {job_id}")
 
-    def run(self):
-        """Main worker loop"""
-        logger.info("Starting Simple Redis Worker...")
+    def _dead_letter(self, pipe, job_json: bytes, error: str):
+        """Queue a failed job payload onto the dead-letter stream"""
+        pipe.xadd(
+            self.dlq_stream,
+            {"payload": job_json, "error": error, "consumer": self.consumer_name},
+            maxlen=10000,
+            approximate=True
+        )
 
-        while True:
+    def _ensure_consumer_group(self):
+        """Create the consumer group (and stream) if it does not exist yet"""
+        try:
+            self.redis_client.xgroup_create(self.stream_name, self.group_name, id="0", mkstream=True)
+            logger.info(f"Created consumer group {self.group_name} on {self.stream_name}")
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _migrate_legacy_queue(self):
+        """Move jobs left in the pre-stream LIST queue onto the stream.
+
+        Covers jobs submitted before the switch to Streams: the queue itself and
+        the per-worker in-flight lists of old workers, which must be stopped first.
+        """
+        keys = [self.legacy_queue, *self.redis_client.scan_iter(match=self.legacy_processing_pattern)]
+        for key in keys:
             try:
-                # Check Redis connection with retry
-                try:
-                    self.redis_client.ping()
-                except Exception as e:
-                    logger.error(f"Redis ping failed, attempting reconnection: {e}")
-                    self.redis_client = self._create_redis_connection()
-
-                # Try to get job from queue (blocking with timeout)
-                job_data = self.redis_client.blpop(self.queue_name, timeout=5)
-
-                if job_data:
-                    queue_name, job_json = job_data
-                    logger.info(f"Received job from queue: {queue_name}")
+                moved = self.redis_client.eval(_MIGRATE_LIST_SCRIPT, 2, key, self.stream_name)
+            except redis.ResponseError as e:
+                # Not one of ours (e.g. WRONGTYPE) - leave it alone
+                logger.warning(f"Skipping legacy key {key!r}: {e}")
+                continue
+            if moved:
+                logger.warning(f"Migrated {moved} job(s) from legacy list {key!r} to {self.stream_name}")
+
+    def _reclaim_stale_jobs(self, count: int) -> List:
+        """Claim up to `count` pending entries abandoned by crashed consumers (XPENDING recovery)"""
+        try:
+            resp = self.redis_client.xautoclaim(
+                self.stream_name,
+                self.group_name,
+                self.consumer_name,
+                min_idle_time=self.reclaim_idle_ms,
+                start_id="0-0",
+                count=count
+            )
+        except redis.ResponseError as e:
+            if "NOGROUP" not in str(e):
+                raise
+            # Stream was deleted (e.g. clear_queue) - recreate; nothing to reclaim
+            self._ensure_consumer_group()
+            return []
+        # Entries still running here only look idle if a heartbeat was missed
+        with self._slots:
+            reclaimed = [
+                entry for entry in resp[1]
+                if entry and entry[1] and entry[0] not in self._in_flight_ids
+            ]
+
+        if reclaimed:
+            logger.warning(f"Reclaimed {len(reclaimed)} orphaned job(s) from {self.stream_name}")
+        return reclaimed
+
+    def _read_jobs(self, count: int) -> List:
+        """Read up to `count` new entries for this consumer, blocking up to 5s"""
+        try:
+            resp = self.redis_client.xreadgroup(
+                self.group_name,
+                self.consumer_name,
+                {self.stream_name: ">"},
+                count=count,
+                block=5000
+            )
+        except redis.ResponseError as e:
+            if "NOGROUP" not in str(e):
+                raise
+            # Stream was deleted (e.g. clear_queue) - recreate and retry next loop
+            self._ensure_consumer_group()
+            return []
+
+        return [entry for _, entries in resp for entry in entries] if resp else []
+
+    def _handle_job(self, entry):
+        """Parse, process and save a single stream entry"""
+        msg_id, fields = entry
+        job_json = fields.get(b"payload", b"")
+        logger.info(f"Received job {msg_id.decode()} from stream: {self.stream_name}")
 
-                    try:
-                        # Parse job data
-                        job_data = json.loads(job_json)
-                        logger.info(f"Job data parsed: {job_data}")
-
-                        # Process the job with retry mechanism
-                        result = self.process_job_with_retry(job_data)
-
-                        # Save result
-                        self.save_result(job_data['job_id'], result)
-
-                        if 'error' in result:
-                            logger.error(f"Job {job_data['job_id']} failed after retries")
-                        else:
-                            logger.info(f"Job {job_data['job_id']} processed successfully")
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Invalid JSON in job data: {e}")
-                    except KeyError as e:
-                        logger.error(f"Missing required field in job data: {e}")
-                    except Exception as e:
-                        logger.error(f"Unexpected error processing job: {e}")
-                        logger.error(f"Traceback: {traceback.format_exc()}")
+        try:
+            # Parse job data
+            job_data = orjson.loads(job_json)
+            logger.info(f"Job data parsed: {job_data}")
+            job_id = job_data['job_id']
+
+            # Process the job with retry mechanism
+            result = self.process_job_with_retry(job_data)
+
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in job data: {e}")
+            error = f"Invalid JSON in job data: {e}"
+        except KeyError as e:
+            logger.error(f"Missing required field in job data: {e}")
+            error = f"Missing required field in job data: {e}"
+        except Exception as e:
+            logger.error(f"Unexpected error processing job: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            error = str(e)
+        else:
+            # Save result (also acks the stream entry)
+            if self._save_result_with_retry(job_id, result, msg_id, job_json):
+                if isinstance(result, dict):
+                    logger.error(f"Job {job_id} failed after retries")
                 else:
-                    # No job received, continue loop
-                    logger.debug("No jobs in queue, continuing...")
+                    logger.info(f"Job {job_id} processed successfully")
+            return
 
-            except KeyboardInterrupt:
-                logger.info("Worker stopped by user")
-                break
+        # Unprocessable entry - dead-letter and ack it
+        try:
+            with self.redis_client.pipeline(transaction=False) as pipe:
+                self._dead_letter(pipe, job_json, error)
+                pipe.xack(self.stream_name, self.group_name, msg_id)
+                pipe.xdel(self.stream_name, msg_id)
+                pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Failed to dead-letter stream entry {msg_id}: {e}")
+
+    def _save_result_with_retry(self, job_id: int, result: Union[FinalResult, Dict[str, Any]],
+                                msg_id: bytes, job_json: bytes, max_retries: int = 3) -> bool:
+        """Save a processed job's result, retrying Redis errors.
+
+        The job row is already final by now, so a failed save must not dead-letter
+        the entry: once retries run out it is left pending for reclaim instead.
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                self.save_result(job_id, result, msg_id, job_json)
+                return True
+            except redis.RedisError as e:
+                if attempt == max_retries:
+                    logger.error(
+                        f"Failed to save result for job {job_id}, leaving entry "
+                        f"{msg_id.decode()} pending: {e}"
+                    )
+                    return False
+                delay = _backoff_delay(attempt, 0.5, 5.0)
+                logger.warning(f"Saving result for job {job_id} failed, retrying in {delay:.2f}s: {e}")
+                time.sleep(delay)
             except Exception as e:
-                logger.error(f"Unexpected error in worker loop: {e}")
-                logger.error(f"Traceback: {traceback.format_exc()}")
-                time.sleep(5)
+                logger.error(f"Failed to save result for job {job_id}, leaving entry {msg_id.decode()} pending: {e}")
+                return False
+
+    def _wait_for_free_slots(self) -> int:
+        """Block until at least one job slot is free; return the number of free slots"""
+        with self._slots:
+            while len(self._in_flight_ids) >= self.concurrency:
+                self._slots.wait()
+            return self.concurrency - len(self._in_flight_ids)
+
+    def _release_slot(self, msg_id: bytes, _future):
+        with self._slots:
+            self._in_flight_ids.discard(msg_id)
+            self._slots.notify()
+
+    def _submit_job(self, entry):
+        """Hand a stream entry to the thread pool, occupying one slot until it finishes"""
+        msg_id = entry[0]
+        with self._slots:
+            self._in_flight_ids.add(msg_id)
+        self.executor.submit(self._handle_job, entry).add_done_callback(partial(self._release_slot, msg_id))
+
+    def _heartbeat_loop(self):
+        """Reset the idle time of in-flight entries so long-running jobs are not reclaimed"""
+        while not self._stopping.wait(self.heartbeat_interval):
+            with self._slots:
+                msg_ids = list(self._in_flight_ids)
+            if not msg_ids:
+                continue
+            try:
+                # JUSTID: only touch ownership/idle time, leave the delivery count alone
+                self.redis_client.xclaim(
+                    self.stream_name,
+                    self.group_name,
+                    self.consumer_name,
+                    min_idle_time=0,
+                    message_ids=msg_ids,
+                    justid=True
+                )
+            except redis.RedisError as e:
+                logger.warning(f"Failed to refresh {len(msg_ids)} in-flight entries: {e}")
+
+    def _reconnect(self) -> bool:
+        """Drop stale sockets and reconnect; returns False if Redis is still unreachable"""
+        self._pool.disconnect()
+        try:
+            self.redis_client = self._create_redis_connection()
+            return True
+        except Exception as e:
+            logger.error(f"Redis reconnection failed, will retry: {e}")
+            return False
 
+    def _fetch_jobs(self, reclaim: bool) -> List:
+        """Reclaim orphaned entries when due, otherwise read new ones"""
+        free_slots = self._wait_for_free_slots()
+
+        # Periodically (and on startup) pick up entries orphaned by crashed
+        # consumers before reading new ones
+        jobs = self._reclaim_stale_jobs(free_slots) if reclaim else []
+        if not jobs:
+            jobs = self._read_jobs(free_slots)
+        return jobs
+
+    def run(self):
+        """Main worker loop"""
+        logger.info(f"Starting Simple Redis Worker (concurrency={self.concurrency})...")
+        self._ensure_consumer_group()
+        self._migrate_legacy_queue()
+        last_reclaim = float('-inf')  # reclaim orphaned entries on startup
+        threading.Thread(target=self._heartbeat_loop, name="stream-heartbeat", daemon=True).start()
+        last_ping = time.monotonic()
+
+        try:
+            while True:
+                # Blocking reads already fail fast on a dead connection, so the
+                # explicit ping only runs periodically as an extra health signal
+                now = time.monotonic()
+                if now - last_ping >= self.ping_interval:
+                    last_ping = now
+                    try:
+                        self.redis_client.ping()
+                    except redis.RedisError as e:
+                        logger.error(f"Redis ping failed, attempting reconnection: {e}")
+                        if not self._reconnect():
+                            time.sleep(5)
+                            continue
+
+                # Evaluations mostly wait on Gemini, so keep up to `concurrency`
+                # jobs running and only read as many entries as there are free slots
+                reclaim = time.monotonic() - last_reclaim >= self.reclaim_interval
+                try:
+                    jobs = self._fetch_jobs(reclaim)
+                except redis.ConnectionError as e:
+                    logger.error(f"Lost Redis connection while reading jobs: {e}")
+                    time.sleep(5)
+                    self._reconnect()
+                    last_ping = time.monotonic()
+                    continue
+                except redis.RedisError as e:
+                    logger.error(f"Redis error while reading jobs: {e}")
+                    time.sleep(5)
+                    continue
+
+                if reclaim:
+                    last_reclaim = time.monotonic()
+                for entry in jobs:
+                    self._submit_job(entry)
+
+        except KeyboardInterrupt:
+            logger.info("Worker stopped by user")
+
+        # Let running jobs finish (queued ones stay pending for reclaim) so their
+        # final status updates are in the writer before the last flush
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self._stopping.set()
+        self.status_writer.flush()
         logger.info("Worker shutdown complete")
 
 def main():
     """Main entry point"""
+    # Load PyMuPDF and start a PDF worker process before the first job
+    start_pdf_workers()
     worker = SimpleWorker()
     worker.run()
 
@@ -12,7 +12,9 @@ def process_uploaded_file_task(doc_id: int, path: str, doc_type: str) -> None:
     pass
 
 
-@celery.task(name="evaluate.run_job", bind=True, autoretry_for=(Exception,), retry_backoff=10, retry_kwargs={"max_retries": 5})
+# No Celery autoretry here: the AI engine already retries transient LLM errors,
+# and stacking both multiplies attempts while Gemini is overloaded
+@celery.task(name="evaluate.run_job", bind=True)
 def run_job_task(self, job_id: int) -> None:
     """Run evaluation job in background"""
     # Optional soft time limit to avoid long-hanging tasks
@@ -1,22 +1,32 @@
 #!/usr/bin/env python3
 """
-Start Celery worker with proper task registration.
+Start the background worker.
+
+WORKER_IMPL selects the implementation:
+  simple (default) - Redis Streams SimpleWorker
+  celery           - legacy Celery worker (Celery is only imported in this mode)
 """
 
 import os
+import sys
 
 # Set environment variables
 os.environ.setdefault("REDIS_URL", "redis://redis:6379/0")
 os.environ.setdefault("REDIS_BACKEND", "redis://redis:6379/1")
 
-# Import celery app first
-from src.workers.celery_app import celery
 
-# Import tasks to register them
-from src.workers import tasks
+def start_simple_worker():
+    from src.workers.simple_worker import main as simple_main
 
+    print("Starting SimpleWorker...")
+    simple_main()
+
+
+def start_celery_worker():
+    # Import celery app first, then tasks to register them
+    from src.workers.celery_app import celery
+    from src.workers import tasks  # noqa: F401
 
-def main():
     print("Starting Celery worker with tasks...")
     print("Registered tasks:", list(celery.tasks.keys()))
 
@@ -31,5 +41,20 @@ def main():
     )
 
 
+WORKER_IMPLS = {
+    "simple": start_simple_worker,
+    "celery": start_celery_worker,
+}
+
+
+def main():
+    impl = os.getenv("WORKER_IMPL", "simple").strip().lower()
+    start = WORKER_IMPLS.get(impl)
+    if start is None:
+        print(f"Unknown WORKER_IMPL '{impl}', expected one of: {', '.join(WORKER_IMPLS)}")
+        sys.exit(1)
+    start()
+
+
 if __name__ == "__main__":
     main()
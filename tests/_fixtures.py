@@ -0,0 +1,76 @@
+"""
+Shared CV / report / case study fixtures untuk test scripts
+"""
+
+CV_TEXT = """John Doe
+Senior Backend Engineer
+
+Experience:
+- 5 years Python development with Django and FastAPI
+- 3 years microservices architecture
+- 2 years Redis and PostgreSQL
+- 1 year AI/ML integration with TensorFlow
+- Experience with Docker, Kubernetes, and cloud deployment
+
+Skills: Python, Django, FastAPI, Redis, PostgreSQL, Docker, Kubernetes, TensorFlow, NLP
+
+Projects:
+- Built scalable e-commerce backend handling 10K+ requests/sec
+- Implemented real-time analytics pipeline with Redis
+- Developed AI-powered recommendation engine"""
+
+REPORT_TEXT = """Project Implementation Report: AI-Powered Document Analysis System
+
+Technical Architecture:
+- Backend: FastAPI with async support
+- Database: PostgreSQL for primary storage, Redis for caching
+- Vector Storage: ChromaDB for document embeddings
+- AI Integration: Google Gemini for document analysis
+- Task Queue: Celery with Redis broker
+- Monitoring: Comprehensive health checks and metrics
+
+Implementation Details:
+
+1. API Design
+- RESTful API endpoints for document upload and processing
+- Async request handling for improved performance
+- Comprehensive error handling and logging
+- Rate limiting and authentication middleware
+
+2. Document Processing Pipeline
+- PDF/text extraction with PyMuPDF
+- Text chunking and preprocessing
+- Vector embedding generation
+- Storage in ChromaDB with metadata
+
+3. RAG System Implementation
+- Document retrieval using semantic search
+- Context-aware prompt engineering
+- Chain-of-thought reasoning for complex queries
+- Result caching with Redis
+
+4. System Integration
+- Docker containerization for all services
+- Environment-based configuration
+- Health monitoring with comprehensive checks
+- Metrics collection and reporting
+
+5. Production Readiness Features
+- Comprehensive error handling and retry logic
+- Graceful degradation when AI services fail
+- Task queue for background processing
+- Resource monitoring and scaling considerations
+
+Performance Metrics:
+- Average response time: <200ms for cached queries
+- Document processing throughput: 100+ docs/minute
+- System uptime: 99.9%+ with proper monitoring
+- Memory usage: Optimized with efficient caching
+
+Challenges and Solutions:
+- Implemented robust error handling for AI API failures
+- Created fallback mechanisms for service degradation
+- Optimized vector search for better performance
+- Added comprehensive logging for debugging"""
+
+CASE_TEXT = "Build an AI-powered document analysis system using RAG architecture"
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test per-thread SQLite connection reuse in src.models.database
+"""
+import os
+import sys
+import logging
+import sqlite3
+import tempfile
+import threading
+
+# Repo root on the path so the script also runs standalone
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models import database
+from src.models.database import Document, Job, get_db_connection, close_db_connection, init_db
+
+# Progress output goes through logging; TEST_LOGLEVEL=WARNING silences it
+logging.basicConfig(level=os.environ.get("TEST_LOGLEVEL", "INFO"), format="%(message)s")
+log = logging.getLogger(__name__)
+
+
+def _in_temp_db(test):
+    """Run test with database.db in a fresh temporary working directory"""
+    def wrapper():
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                close_db_connection()
+                init_db()
+                test()
+            finally:
+                close_db_connection()
+                os.chdir(cwd)
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@_in_temp_db
+def test_connection_reused_per_thread():
+    """Same thread gets the same connection; other threads get their own"""
+    conn = get_db_connection()
+    assert get_db_connection() is conn
+
+    other = []
+    t = threading.Thread(target=lambda: other.append(get_db_connection()))
+    t.start()
+    t.join()
+    assert other[0] is not conn
+    log.info("   ✅ Connection reused within a thread, separate across threads")
+
+
+@_in_temp_db
+def test_failed_write_does_not_leak_into_next_call():
+    """A call that raises mid-transaction leaves nothing for the next call to commit"""
+    doc_id = Document.create("cv", "cv.txt", "/tmp/cv.txt")
+
+    # Simulate a model method that raises between execute() and close()
+    conn = get_db_connection()
+    try:
+        conn.execute(
+            "INSERT INTO documents (doc_type, filename, path) VALUES (?, ?, ?)",
+            ("cv", "partial.txt", "/tmp/partial.txt"),
+        )
+        raise sqlite3.OperationalError("boom")
+    except sqlite3.OperationalError:
+        pass
+    assert conn.in_transaction
+
+    # The next call on this thread starts clean and commits only its own write
+    job_id = Job.create("Backend Engineer", doc_id, doc_id)
+    assert not get_db_connection().in_transaction
+    assert Document.count() == 1
+    assert Job.get_by_id(job_id)["cv_id"] == doc_id
+    log.info("   ✅ Partial write from a failed call was rolled back")
+
+
+@_in_temp_db
+def test_close_keeps_connection_open():
+    """close() only ends the transaction; close_db_connection() really closes"""
+    conn = get_db_connection()
+    conn.close()
+    assert conn.execute("SELECT 1").fetchone()[0] == 1
+
+    close_db_connection()
+    assert database._local.conn is None
+    assert get_db_connection() is not conn
+    log.info("   ✅ close() keeps the cached connection usable")
+
+
+if __name__ == "__main__":
+    log.info("🧪 Testing SQLite connection reuse")
+    test_connection_reused_per_thread()
+    test_failed_write_does_not_leak_into_next_call()
+    test_close_keeps_connection_open()
+    log.warning("📊 Final Result: SUCCESS")
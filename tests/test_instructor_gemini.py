@@ -3,6 +3,7 @@
 Test instructor integration with Gemini API
 """
 import os
+import logging
 import sys
 
 # Set environment variables
@@ -15,21 +16,25 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.core.ai_engine import available, evaluate_cv, evaluate_project, synthesize_overall
 
+# Progress output goes through logging; TEST_LOGLEVEL=WARNING silences it
+logging.basicConfig(level=os.environ.get("TEST_LOGLEVEL", "INFO"), format="%(message)s")
+log = logging.getLogger(__name__)
+
 def test_instructor_with_gemini():
     """Test instructor integration with Gemini"""
-    print("🧪 Testing Instructor with Gemini API")
-    print("=" * 50)
+    log.info("🧪 Testing Instructor with Gemini API")
+    log.info("=" * 50)
 
     # Check availability
     ai_available = available()
-    print(f"AI Engine Available: {ai_available}")
+    log.info(f"AI Engine Available: {ai_available}")
 
     if not ai_available:
-        print("❌ AI Engine not available, cannot test")
+        log.error("❌ AI Engine not available, cannot test")
         return False
 
     # Test CV evaluation
-    print("\n📄 Testing CV evaluation with instructor...")
+    log.info("\n📄 Testing CV evaluation with instructor...")
     try:
         cv_text = """
         Jane Smith
@@ -53,19 +58,19 @@ def test_instructor_with_gemini():
         """.strip()
 
         cv_result = evaluate_cv(cv_text, "Senior AI/ML Engineer")
-        print(f"✅ CV Evaluation SUCCESS:")
-        print(f"   Match Rate: {cv_result.cv_match_rate}")
-        print(f"   Feedback: {cv_result.cv_feedback}")
-        print(f"   Using instructor with Gemini: True")
+        log.info(f"✅ CV Evaluation SUCCESS:")
+        log.info(f"   Match Rate: {cv_result.cv_match_rate}")
+        log.info(f"   Feedback: {cv_result.cv_feedback}")
+        log.info(f"   Using instructor with Gemini: True")
 
     except Exception as e:
-        print(f"❌ CV evaluation failed: {e}")
+        log.error(f"❌ CV evaluation failed: {e}")
         import traceback
         traceback.print_exc()
         return False
 
     # Test Project evaluation
-    print("\n📊 Testing Project evaluation with instructor...")
+    log.info("\n📊 Testing Project evaluation with instructor...")
     try:
         project_text = """
         Project: Production-Grade RAG System for Enterprise Knowledge Management
@@ -114,34 +119,34 @@ def test_instructor_with_gemini():
         case_brief = "Build enterprise-grade RAG system with multi-modal support, real-time processing, and production-ready scalability"
 
         project_result = evaluate_project(project_text, case_brief)
-        print(f"✅ Project Evaluation SUCCESS:")
-        print(f"   Score: {project_result.project_score}")
-        print(f"   Feedback: {project_result.project_feedback}")
-        print(f"   Using instructor with Gemini: True")
+        log.info(f"✅ Project Evaluation SUCCESS:")
+        log.info(f"   Score: {project_result.project_score}")
+        log.info(f"   Feedback: {project_result.project_feedback}")
+        log.info(f"   Using instructor with Gemini: True")
 
     except Exception as e:
-        print(f"❌ Project evaluation failed: {e}")
+        log.error(f"❌ Project evaluation failed: {e}")
         import traceback
         traceback.print_exc()
         return False
 
     # Test synthesis
-    print("\n🔗 Testing synthesis with instructor...")
+    log.info("\n🔗 Testing synthesis with instructor...")
     try:
         overall_result = synthesize_overall(cv_result, project_result)
-        print(f"✅ Synthesis SUCCESS:")
-        print(f"   Overall Summary: {overall_result.overall_summary}")
-        print(f"   Using instructor with Gemini: True")
+        log.info(f"✅ Synthesis SUCCESS:")
+        log.info(f"   Overall Summary: {overall_result.overall_summary}")
+        log.info(f"   Using instructor with Gemini: True")
 
     except Exception as e:
-        print(f"❌ Synthesis failed: {e}")
+        log.error(f"❌ Synthesis failed: {e}")
         import traceback
         traceback.print_exc()
         return False
 
-    print("\n🎉 All instructor tests passed! Gemini integration with instructor works correctly.")
+    log.info("\n🎉 All instructor tests passed! Gemini integration with instructor works correctly.")
     return True
 
 if __name__ == "__main__":
     success = test_instructor_with_gemini()
-    print(f"\n📊 Test result: {'SUCCESS' if success else 'FAILED'}")
\ No newline at end of file
+    log.warning(f"\n📊 Test result: {'SUCCESS' if success else 'FAILED'}")
\ No newline at end of file